@@ -1,15 +1,19 @@
+from __future__ import annotations
+
 import pandas as pd
-import re
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import logging
 import json
 import os
 import traceback
-import networkx as nx
-import matplotlib.pyplot as plt
-from itertools import product, combinations
-import uuid
-import time
-from bpmn_python import bpmn_diagram_rep as bpmn
+from itertools import product, combinations, chain
+from collections import Counter, defaultdict
+from collections.abc import Mapping, Sequence
+from functools import lru_cache, cached_property
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 
 # Configuration
 PARAMETERS_PATH = ""
@@ -27,9 +31,46 @@ param = read_parameters(os.path.join(PARAMETERS_PATH, PARAMETERS_FILE_NAME))
 THIS_SCRIPT_LOG_PATH = os.path.join(PARAMETERS_PATH, param['log_file_name'])
 logging.basicConfig(filename=THIS_SCRIPT_LOG_PATH, level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
 
+# Footprint relationships, indexed by their code in the footprint matrix
+NO_RELATION, CAUSALITY, REVERSE_CAUSALITY, PARALLEL = range(4)
+RELATIONSHIPS = (" # ", "-->", "<--", "| |")
+
+# Below this many events the pure Python kernels are fast enough to not be worth the JIT
+JIT_MIN_EVENTS = 20
+
+@lru_cache(maxsize=None)
+def jit_kernels():
+    """
+    Imports the Numba kernels on first use, numba alone takes a good part of the import time.
+    
+    Returns:
+        module: alpha_numba, or None if numba is not installed.
+    """
+    try:
+        import alpha_numba
+    except ImportError:
+        return None
+    return alpha_numba
+
+def use_jit(events):
+    """
+    Tells whether the Numba kernels should be used for a set of events.
+    
+    Parameters:
+        events (list): Events of the footprint.
+
+    Returns:
+        bool: True if Numba is available and the events fit in a uint64 bitmask.
+    """
+    if len(events) < JIT_MIN_EVENTS:
+        return False
+    kernels = jit_kernels()
+    return kernels is not None and len(events) <= kernels.MAX_EVENTS
+
 def read_log_file(analysed_file_name: str):
     """
     Reads a CSV log file and returns a dictionary of trace frequencies.
+    The parsed log is cached until the file is modified.
     
     Parameters:
         analysed_file_name (str): Path to the log file.
@@ -37,17 +78,49 @@ def read_log_file(analysed_file_name: str):
     Returns:
         dict: Trace dictionary with frequencies.
     """
-    analysed_log = os.path.join(param['analysed_log_path'], analysed_file_name)
-    df_log = pd.read_csv(analysed_log, usecols=['case_id', 'activity_name', 'timestamp'])
+    analysed_log = os.path.abspath(os.path.join(param['analysed_log_path'], analysed_file_name))
+    file_stat = os.stat(analysed_log)
+    return dict(parse_log_file(analysed_log, file_stat.st_mtime_ns, file_stat.st_size))
+
+@lru_cache(maxsize=32)
+def parse_log_file(analysed_log, mtime_ns, size):
+    """
+    Parses a CSV log file into a dictionary of trace frequencies.
+    mtime_ns and size are only used as cache key, so that a modified file is parsed again.
+    
+    Parameters:
+        analysed_log (str): Absolute path to the log file.
+        mtime_ns (int): Modification time of the file in nanoseconds.
+        size (int): Size of the file in bytes.
+
+    Returns:
+        dict: Trace dictionary with frequencies.
+    """
+    # Multi-threaded Arrow parse, the dictionary encoded activities arrive in pandas as a categorical column.
+    # Empty activities are read as null (nan) like pandas does
+    convert_options = pacsv.ConvertOptions(
+        include_columns=['case_id', 'activity_name', 'timestamp'],
+        column_types={'timestamp': pa.string(), 'activity_name': pa.dictionary(pa.int32(), pa.string())},
+        strings_can_be_null=True)
+    df_log = pacsv.read_csv(analysed_log, read_options=pacsv.ReadOptions(use_threads=True),
+                            convert_options=convert_options).to_pandas()
+    if df_log.empty:
+        return {}
+    # Arrow only parses ISO timestamps, pandas also reads the other formats (e.g. YYYY/MM/DD-HH:MM:SS)
     df_log['timestamp'] = pd.to_datetime(df_log['timestamp'])
-    df_grouped = df_log.sort_values(by=['case_id', 'timestamp']) \
-                       .groupby('case_id')['activity_name'] \
-                       .apply(list) \
-                       .reset_index(name='trace')
-    df_grouped['trace'] = df_grouped['trace'].apply(tuple)
-    trace_counts = df_grouped['trace'].value_counts()
-    trace_dict = trace_counts.to_dict()
-    return {trace: {'count': count, 'frequency': count / len(df_grouped)} for trace, count in trace_dict.items()}
+    df_log.sort_values(by=['case_id', 'timestamp'], inplace=True, kind='mergesort')
+    # Once sorted, every trace is a contiguous slice of the activity codes
+    case_ids = df_log['case_id'].to_numpy()
+    codes = df_log['activity_name'].cat.codes.to_numpy()
+    boundaries = [0, *(np.flatnonzero(case_ids[1:] != case_ids[:-1]) + 1).tolist(), len(codes)]
+    trace_counts = Counter(codes[start:end].tobytes() for start, end in zip(boundaries, boundaries[1:]))
+    total_traces = len(boundaries) - 1
+
+    # Only the distinct traces are translated to names, a missing activity (code -1) reads the trailing nan
+    activities = [*df_log['activity_name'].cat.categories.tolist(), np.nan]
+    return {tuple(activities[code] for code in np.frombuffer(trace, dtype=codes.dtype).tolist()):
+                {'count': count, 'frequency': count / total_traces}
+            for trace, count in trace_counts.most_common()}
 
 def identify_all_nodes(trace_dict):
     """
@@ -59,11 +132,9 @@ def identify_all_nodes(trace_dict):
     Returns:
         list: List of all nodes.
     """
-    nodes = ['start']
-    for trace in trace_dict.keys():
-        nodes.extend(event for event in trace if event not in nodes)
-    nodes.append('end')
-    return nodes
+    # dict keys keep the first-seen order without scanning a list for every event
+    events = dict.fromkeys(event for trace in trace_dict.keys() for event in trace)
+    return ['start', *events, 'end']
 
 def identify_initial_and_final_events(trace_dict):
     """
@@ -79,6 +150,27 @@ def identify_initial_and_final_events(trace_dict):
     final_events = {trace[-1] for trace in trace_dict.keys()}
     return list(initial_events), list(final_events)
 
+class DirectlyFollows:
+    """
+    Directly-follows counts stored as a sparse matrix over the nodes.
+    matrix[i, j] counts how often nodes[j] directly follows nodes[i], nodes[0] is 'start' and nodes[-1] is 'end'.
+    """
+
+    def __init__(self, nodes, matrix):
+        self.nodes = nodes
+        self.matrix = matrix
+
+    def to_dict(self):
+        """
+        Materializes the relations as a dictionary, for display.
+
+        Returns:
+            dict: Directly-follows relations with counts.
+        """
+        relations = self.matrix.tocoo()
+        return {(self.nodes[a], self.nodes[b]): count
+                for a, b, count in zip(relations.row.tolist(), relations.col.tolist(), relations.data.tolist())}
+
 def compute_directly_follows(trace_dict, start_events, end_events):
     """
     Computes directly-follows relations including start and end events.
@@ -89,183 +181,400 @@ def compute_directly_follows(trace_dict, start_events, end_events):
         end_events (set): Set of end events.
 
     Returns:
-        dict: Directly-follows relations with counts.
+        DirectlyFollows: Directly-follows relations with counts.
     """
-    directly_follows = {}
     start_events = set(start_events)
     end_events = set(end_events)
-    
+    traces = list(trace_dict.keys())
+    if not traces:
+        return DirectlyFollows(['start', 'end'], csr_matrix((2, 2), dtype=np.int64))
+
+    quantities = []
     for trace, metrics in trace_dict.items():
         qty = metrics.get('count', 0)
         if not isinstance(qty, int):
             raise ValueError(f"Count for trace {trace} is not an integer: {qty}")
-        
-        if trace[0] in start_events:
-            directly_follows[('start', trace[0])] = directly_follows.get(('start', trace[0]), 0) + qty
-        
-        for i in range(len(trace) - 1):
-            pair = (trace[i], trace[i + 1])
-            directly_follows[pair] = directly_follows.get(pair, 0) + qty
-        
-        if trace[-1] in end_events:
-            directly_follows[(trace[-1], 'end')] = directly_follows.get((trace[-1], 'end'), 0) + qty
-    
-    return directly_follows
+        quantities.append(qty)
+
+    # Lay the traces end to end as codes 1..n, each framed by the start code 0 and the end code n + 1
+    codes, activities = pd.factorize(np.fromiter(chain.from_iterable(traces), dtype=object), sort=True,
+                                    use_na_sentinel=False)
+    # A negative code would be shifted onto the start code 0 below and silently counted as start
+    if (codes < 0).any():
+        raise ValueError("Traces contain activities without a code")
+    nodes = ['start', *activities, 'end']
+    n_nodes = len(nodes)
+    lengths = np.fromiter(map(len, traces), dtype=np.int64, count=len(traces))
+    trace_ends = np.cumsum(lengths)
+    trace_starts = trace_ends - lengths
+    # np.insert keeps the given order for equal positions, so a trace's end code comes before the next start code
+    codes = np.insert(codes.astype(np.int64) + 1,
+                      np.concatenate((trace_ends, trace_starts)),
+                      np.concatenate((np.full(len(traces), n_nodes - 1), np.zeros(len(traces), dtype=np.int64))))
+    framed_lengths = lengths + 2
+    weights = np.repeat(np.asarray(quantities, dtype=np.int64), framed_lengths)
+    trace_ids = np.repeat(np.arange(len(traces)), framed_lengths)
+
+    # Consecutive codes of the same trace form a pair, counted at index a * n_nodes + b
+    same_trace = trace_ids[1:] == trace_ids[:-1]
+    pair_index = (codes[:-1] * n_nodes + codes[1:])[same_trace]
+    pair_counts = np.bincount(pair_index, weights=weights[1:][same_trace], minlength=n_nodes * n_nodes)
+    pair_counts = pair_counts.astype(np.int64).reshape(n_nodes, n_nodes)
+
+    # Start and end edges are only kept for the given start and end events, isin also matches a missing activity (nan)
+    node_index = pd.Index(nodes, dtype=object)
+    pair_counts[0, ~node_index.isin(list(start_events))] = 0
+    pair_counts[~node_index.isin(list(end_events)), n_nodes - 1] = 0
+
+    rows, cols = np.nonzero(pair_counts)
+    return DirectlyFollows(nodes, csr_matrix((pair_counts[rows, cols], (rows, cols)), shape=(n_nodes, n_nodes)))
+
+class FootprintMatrix(Mapping):
+    """
+    Footprint relationships stored as a uint8 matrix over event IDs.
+    matrix[i, j] is the position in RELATIONSHIPS of the relationship between events[i] and events[j],
+    rows holds the same codes as nested lists for scans done element by element.
+    Also reads as a dictionary {(a, b): relationship} for display.
+    """
+
+    def __init__(self, events, matrix):
+        self.events = events
+        self.index = {event: i for i, event in enumerate(events)}
+        self.matrix = matrix
+        self.rows = matrix.tolist()
+
+    def __getitem__(self, pair):
+        a, b = pair
+        return RELATIONSHIPS[self.matrix[self.index[a], self.index[b]]]
+
+    def __iter__(self):
+        return iter(product(self.events, repeat=2))
+
+    def __len__(self):
+        return len(self.events) ** 2
+
+    def __repr__(self):
+        return repr(dict(self))
 
 def create_footprint(directly_follows):
     """
     Creates a footprint representation of activity relationships.
     
     Parameters:
-        directly_follows (dict): Directly-follows relations.
+        directly_follows (DirectlyFollows): Directly-follows relations.
 
     Returns:
-        dict: Footprint representation.
+        FootprintMatrix: Footprint representation.
+    """
+    # The footprint only depends on which relations exist between activities, not on their counts
+    follows = (directly_follows.matrix[1:-1, 1:-1] > 0).toarray()
+    return footprint_from_relations(tuple(directly_follows.nodes[1:-1]), follows.tobytes())
+
+@lru_cache(maxsize=32)
+def footprint_from_relations(events, relations):
     """
-    footprint = {}
-    activities = {a for a, b in directly_follows.keys() if a not in {'start', 'end'}}
-    activities.update(b for a, b in directly_follows.keys() if b not in {'start', 'end'})
+    Creates a footprint representation from the directly-follows pattern of the activities.
     
-    for a in activities:
-        for b in activities:
-            if a == b:
-                footprint[(a, b)] = "| |" if (a, a) in directly_follows else " # "
-            else:
-                follows_ab = (a, b) in directly_follows
-                follows_ba = (b, a) in directly_follows
-                if follows_ab and follows_ba:
-                    footprint[(a, b)] = "| |"
-                elif follows_ab:
-                    footprint[(a, b)] = "-->"
-                elif follows_ba:
-                    footprint[(a, b)] = "<--"
-                else:
-                    footprint[(a, b)] = " # "
+    Parameters:
+        events (tuple): Activities, sorted by name.
+        relations (bytes): Row-major bytes of the boolean matrix telling whether events[j] directly follows events[i].
+
+    Returns:
+        FootprintMatrix: Footprint representation.
+    """
+    follows = np.frombuffer(relations, dtype=bool).reshape(len(events), len(events)).astype(np.uint8)
+    # 1 for a --> b, 2 for a <-- b, 3 for both, which is also how a self loop ends up as '| |'
+    matrix = CAUSALITY * follows + REVERSE_CAUSALITY * follows.T
+    # The matrix is shared by every caller of the cache
+    matrix.flags.writeable = False
+    return FootprintMatrix(list(events), matrix)
+
+def iter_bits(mask):
+    """
+    Yields the indices of the set bits of an integer bitmask, lowest first.
     
-    return footprint
+    Parameters:
+        mask (int): Bitmask.
 
-def is_independent_set(footprint_matrix, group_of_events):
+    Returns:
+        generator: Indices of the set bits.
     """
-    Checks if a set of events is independent.
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+def build_neighbor_masks(footprint_matrix):
+    """
+    Builds one bitmask per event marking the events it is related to.
+    Bit j of the i-th mask is set when events i and j are not in a ' # ' relationship.
     
     Parameters:
-        footprint_matrix (dict): Footprint matrix.
-        group_of_events (list): List of events.
+        footprint_matrix (FootprintMatrix): Footprint matrix.
 
     Returns:
-        bool: True if independent, otherwise False.
+        list: Neighbor bitmask of every event.
     """
-    for i in range(len(group_of_events)):
-        for j in range(i + 1, len(group_of_events)):
-            a, b = group_of_events[i], group_of_events[j]
-            if footprint_matrix.get((a, b), ' # ') != ' # ' or footprint_matrix.get((b, a), ' # ') != ' # ':
-                return False
-    return True
+    related = footprint_matrix.matrix != NO_RELATION
+    np.fill_diagonal(related, False)
+    return [sum(1 << int(j) for j in np.flatnonzero(row)) for row in related]
+
+def find_components(footprint_matrix):
+    """
+    Labels the connected components of the footprint graph, whose edges are the pairs not in a ' # ' relationship.
+    Events of different components are always in a ' # ' relationship.
+    
+    Parameters:
+        footprint_matrix (FootprintMatrix): Footprint matrix.
+
+    Returns:
+        list: Component label of every event.
+    """
+    related = csr_matrix(footprint_matrix.matrix != NO_RELATION)
+    _, labels = connected_components(related, directed=False)
+    return labels.tolist()
+
+def bron_kerbosch(R, P, X, adjacency):
+    """
+    Enumerates maximal cliques with the Bron-Kerbosch algorithm with pivoting.
+    Vertex sets are integer bitmasks.
+    
+    Parameters:
+        R (int): Vertices of the clique being built.
+        P (int): Candidate vertices that can extend R.
+        X (int): Vertices already processed that can extend R.
+        adjacency (list): Adjacency bitmask of every vertex.
+
+    Returns:
+        generator: Bitmasks of the maximal cliques.
+    """
+    if not P and not X:
+        yield R
+        return
+    pivot = max(iter_bits(P | X), key=lambda u: (P & adjacency[u]).bit_count())
+    candidates = P & ~adjacency[pivot]
+    while candidates:
+        v = candidates & -candidates
+        candidates ^= v
+        i = v.bit_length() - 1
+        yield from bron_kerbosch(R | v, P & adjacency[i], X & adjacency[i], adjacency)
+        P ^= v
+        X |= v
+
+class IndependentSets(Sequence):
+    """
+    Independent sets stored per component of the footprint graph.
+    components holds, for every component, the non-empty independent sets within it as sorted tuples of event IDs,
+    ordered by size then IDs. Events of different components are independent, so every independent set is the union
+    of at most one set of every component; this product is only built when the sets are read as a sequence, for display.
+    """
+
+    def __init__(self, components):
+        self.components = components
+
+    @cached_property
+    def sets(self):
+        """
+        Materializes every independent set, ordered by size then IDs.
+
+        Returns:
+            list: List of independent sets, each a sorted tuple of event IDs.
+        """
+        masks = [0]
+        for component_sets in self.components:
+            component_masks = [0, *(sum(1 << i for i in event_set) for event_set in component_sets)]
+            masks = [mask | component_mask for mask in masks for component_mask in component_masks]
+        masks.remove(0)
+        masks.sort(key=lambda mask: (mask.bit_count(), list(iter_bits(mask))))
+        return [tuple(iter_bits(mask)) for mask in masks]
+
+    def __getitem__(self, i):
+        return self.sets[i]
+
+    def __iter__(self):
+        return iter(self.sets)
+
+    def __len__(self):
+        count = 1
+        for component_sets in self.components:
+            count *= len(component_sets) + 1
+        return count - 1
+
+    def __repr__(self):
+        return repr(self.sets)
 
 def find_independent_sets(footprint_matrix):
     """
     Finds independent sets of events based on the footprint matrix.
+    The maximal independent sets are the maximal cliques of the complement of the footprint graph,
+    every other independent set is a subset of one of them.
+    Events of different components are independent, so the cliques are enumerated per component
+    and the sets are kept per component.
     
     Parameters:
-        footprint_matrix (dict): Footprint matrix.
+        footprint_matrix (FootprintMatrix): Footprint matrix.
 
     Returns:
-        list: List of independent sets.
+        IndependentSets: Independent sets of every component, reading as the list of all independent sets.
     """
-    independent_sets = []
-    events = {a for (a, b) in footprint_matrix.keys()} | {b for (a, b) in footprint_matrix.keys()}
-    events = list(events)
+    events = footprint_matrix.events
+    neighbors = build_neighbor_masks(footprint_matrix)
+    all_events = (1 << len(events)) - 1
+    complement = [all_events & ~mask & ~(1 << i) for i, mask in enumerate(neighbors)]
 
-    for r in range(1, len(events) + 1):
-        for subset in combinations(events, r):
-            if is_independent_set(footprint_matrix, subset):
-                independent_sets.append(set(subset))
-    
-    return independent_sets
+    component_masks = defaultdict(int)
+    for i, label in enumerate(find_components(footprint_matrix)):
+        component_masks[label] |= 1 << i
+
+    components = []
+    for component_mask in component_masks.values():
+        if use_jit(events):
+            cliques = jit_kernels().maximal_cliques(np.array(complement, dtype=np.uint64), np.uint64(component_mask))
+            maximal_masks = [int(mask) for mask in cliques]
+        else:
+            maximal_masks = bron_kerbosch(0, component_mask, 0, complement)
+
+        component_sets = set()
+        for maximal_mask in maximal_masks:
+            subset = maximal_mask
+            while subset:
+                component_sets.add(subset)
+                subset = (subset - 1) & maximal_mask
+        ordered_masks = sorted(component_sets, key=lambda mask: (mask.bit_count(), list(iter_bits(mask))))
+        components.append([tuple(iter_bits(mask)) for mask in ordered_masks])
+
+    return IndependentSets(components)
 
 def check_relationship(footprint_matrix, A, B):
     """
-    Checks the relationship between two events or sets of events.
+    Checks the relationship between two sets of events.
     
     Parameters:
-        footprint_matrix (dict): Footprint matrix.
-        A (str or set): Event or set of events.
-        B (str or set): Event or set of events.
+        footprint_matrix (FootprintMatrix): Footprint matrix.
+        A (list): IDs of the first set of events.
+        B (list): IDs of the second set of events.
 
     Returns:
         str: Relationship if found, otherwise None.
     """
-    if isinstance(A, str) and isinstance(B, str):
-        return footprint_matrix.get((A, B))
+    rows = footprint_matrix.rows
+    first = rows[A[0]][B[0]]
+    # Stop at the first pair whose relationship differs from the first one
+    for a in A:
+        row = rows[a]
+        for b in B:
+            if row[b] != first:
+                return None
+    return RELATIONSHIPS[first]
+
+def related_sets_python(footprint_matrix, independent_sets):
+    """
+    Yields the pairs of independent sets that are in a single relationship other than ' # '.
     
-    relationships = set()
-    if isinstance(A, set) and isinstance(B, set):
-        relationships.update(footprint_matrix.get((a, b)) for a in A for b in B)
-    elif isinstance(A, set):
-        relationships.update(footprint_matrix.get((a, B)) for a in A)
-    elif isinstance(B, set):
-        relationships.update(footprint_matrix.get((A, b)) for b in B)
+    Parameters:
+        footprint_matrix (FootprintMatrix): Footprint matrix.
+        independent_sets (list): List of independent sets as tuples of event IDs.
+
+    Returns:
+        generator: Tuples (set1, set2, relationship).
+    """
+    rows = footprint_matrix.rows
+    for set1, set2 in combinations(independent_sets, 2):
+        # A single ' # ' pair already rules out a transition, test one pair before the whole block
+        if rows[set1[0]][set2[0]] == NO_RELATION:
+            continue
+        relationship = check_relationship(footprint_matrix, set1, set2)
+        if relationship is not None:
+            yield set1, set2, relationship
+
+def related_sets_jit(footprint_matrix, independent_sets):
+    """
+    Same as related_sets_python, with the scan of all pairs done by the Numba kernel.
     
-    return relationships.pop() if len(relationships) == 1 else None
+    Parameters:
+        footprint_matrix (FootprintMatrix): Footprint matrix.
+        independent_sets (list): List of independent sets as tuples of event IDs.
+
+    Returns:
+        generator: Tuples (set1, set2, relationship).
+    """
+    set_sizes = np.array([len(event_set) for event_set in independent_sets], dtype=np.int64)
+    set_events = np.zeros((len(independent_sets), set_sizes.max(initial=1)), dtype=np.int64)
+    for i, event_set in enumerate(independent_sets):
+        set_events[i, :len(event_set)] = event_set
+    codes = jit_kernels().transition_codes(footprint_matrix.matrix, set_events, set_sizes, NO_RELATION)
+    for i, j, code in codes.tolist():
+        yield independent_sets[i], independent_sets[j], RELATIONSHIPS[code]
 
 def find_transitions(footprint_matrix, independent_sets):
     """
     Finds transitions between independent sets.
+    Both sets of a transition lie in the same component of the footprint graph, so only sets within
+    a single component are compared with each other.
     
     Parameters:
-        footprint_matrix (dict): Footprint matrix.
-        independent_sets (list): List of independent sets.
+        footprint_matrix (FootprintMatrix): Footprint matrix.
+        independent_sets (IndependentSets): Independent sets of every component.
 
     Returns:
-        dict: Transitions between independent sets.
+        dict: Transitions between independent sets, keyed by pairs of sorted tuples of event IDs.
     """
+    related_sets = []
+    for component_sets in independent_sets.components:
+        if use_jit(footprint_matrix.events):
+            related_sets.extend(related_sets_jit(footprint_matrix, component_sets))
+        else:
+            related_sets.extend(related_sets_python(footprint_matrix, component_sets))
+    # Keep the transitions in the order of the independent sets (size then IDs), as when all the sets were compared at once
+    related_sets.sort(key=lambda related: (len(related[0]), related[0], len(related[1]), related[1]))
+
     transitions = {}
-    for set1, set2 in combinations(independent_sets, 2):
-        relationship = check_relationship(footprint_matrix, set1, set2)
+    for set1, set2, relationship in related_sets:
         if relationship in ("-->", "| |"):
-            transitions[(tuple(set1), tuple(set2))] = relationship
+            transitions[(set1, set2)] = relationship
         elif relationship == "<--":
-            transitions[(tuple(set2), tuple(set1))] = "-->"
+            transitions[(set2, set1)] = "-->"
     
     return transitions
 
+@lru_cache(maxsize=4096)
 def deconstruct_subset(subset):
     """
     Deconstructs a complex subset into all possible pairs of events.
     
     Parameters:
-        subset (tuple): A complex subset represented as a tuple of frozensets.
+        subset (tuple): A complex subset represented as a pair of sorted tuples of event IDs.
         
     Returns:
-        set: A set of pairs derived from the complex subset.
+        frozenset: A set of pairs derived from the complex subset.
     """
     set1, set2 = subset
-    return set(product(set1, set2))
+    return frozenset(product(set1, set2))
 
 def map_pairs_to_sets(transitions):
     """
-    Maps pairs of events to larger sets they are part of.
+    Deconstructs every complex set and maps each pair of events to the complex sets it is part of.
+    Parallel relationships hold in both directions, so their pairs are also included reversed.
     
     Parameters:
         transitions (dict): A dictionary of transitions with relationships between sets.
         
     Returns:
-        dict: A dictionary where keys are pairs of events and values are sets of larger sets containing those pairs.
+        tuple: A dictionary of the pairs of every complex set, and a dictionary where keys are pairs of events
+            and values are bitmasks of the complex sets containing those pairs (bit i for the i-th transition).
     """
-    pair_to_sets = {}
+    decon = {}
+    pair_to_sets = defaultdict(int)
     
-    for complex_set in transitions.keys():
+    for i, (complex_set, relationship) in enumerate(transitions.items()):
         pairs = deconstruct_subset(complex_set)
-        if transitions.get(complex_set) == '| |':
-            # Include the reverse direction for parallel relationships
-            reverse_pairs = {(b, a) for a, b in pairs}
-            pairs.update(reverse_pairs)
+        if relationship == '| |':
+            pairs = frozenset(chain(pairs, ((b, a) for a, b in pairs)))
+        decon[complex_set] = pairs
         for pair in pairs:
-            if pair not in pair_to_sets:
-                pair_to_sets[pair] = set()
-            pair_to_sets[pair].add(complex_set)
+            pair_to_sets[pair] |= 1 << i
     
-    return pair_to_sets
+    return decon, pair_to_sets
 
 def filter_maximal_sets(transitions):
     """
@@ -277,22 +586,50 @@ def filter_maximal_sets(transitions):
     Returns:
         dict: A dictionary with non-maximal sets removed.
     """
-    pair_to_sets = map_pairs_to_sets(transitions)
-    maximal_sets = set(transitions.keys())
+    decon, pair_to_sets = map_pairs_to_sets(transitions)
+    maximal_sets = {}
     
-    for complex_set in transitions.keys():
-        pairs = deconstruct_subset(complex_set)
-        for pair in pairs:
-            for larger_set in pair_to_sets[pair]:
-                if larger_set != complex_set and all(p in deconstruct_subset(larger_set) for p in pairs):
-                    maximal_sets.discard(complex_set)
-                    break
-            if complex_set not in maximal_sets:
+    for i, (complex_set, relationship) in enumerate(transitions.items()):
+        # Intersecting the masks of all its pairs leaves the complex sets containing every pair of complex_set
+        itself = 1 << i
+        larger_sets = -1
+        for pair in decon[complex_set]:
+            larger_sets &= pair_to_sets[pair]
+            if larger_sets == itself:
                 break
-        
+        if larger_sets == itself:
+            maximal_sets[complex_set] = relationship
+    
+    return maximal_sets
+
+def name_independent_sets(footprint_matrix, independent_sets):
+    """
+    Translates independent sets of event IDs into tuples of event names, for display.
     
-    # Remove transitions that are not in the maximal sets
-    return {complex_set: relationship for complex_set, relationship in transitions.items() if complex_set in maximal_sets}
+    Parameters:
+        footprint_matrix (FootprintMatrix): Footprint matrix the IDs refer to.
+        independent_sets (IndependentSets): Independent sets as tuples of event IDs, all of them are materialized.
+
+    Returns:
+        list: List of independent sets as tuples of event names.
+    """
+    events = footprint_matrix.events
+    return [tuple(events[i] for i in event_set) for event_set in independent_sets]
+
+def name_transitions(footprint_matrix, transitions):
+    """
+    Translates transitions between sets of event IDs into transitions between tuples of event names, for display.
+    
+    Parameters:
+        footprint_matrix (FootprintMatrix): Footprint matrix the IDs refer to.
+        transitions (dict): Transitions keyed by pairs of tuples of event IDs.
+
+    Returns:
+        dict: Transitions keyed by pairs of tuples of event names.
+    """
+    events = footprint_matrix.events
+    return {(tuple(events[i] for i in set1), tuple(events[i] for i in set2)): relationship
+            for (set1, set2), relationship in transitions.items()}
 
 def start_analyser():
     """
@@ -307,9 +644,9 @@ def start_analyser():
         maximal_sets = filter_maximal_sets(transitions)
 
         logging.info(f"Footprint Matrix: {footprint_matrix}")
-        logging.info(f"Independent Sets: {independent_sets}")
-        logging.info(f"Transitions: {transitions}")
-        logging.info(f"Maximal Sets: {maximal_sets}")
+        logging.info(f"Independent Sets: {name_independent_sets(footprint_matrix, independent_sets)}")
+        logging.info(f"Transitions: {name_transitions(footprint_matrix, transitions)}")
+        logging.info(f"Maximal Sets: {name_transitions(footprint_matrix, maximal_sets)}")
     
     except Exception as e:
         logging.error(f"An error occurred: {str(e)}")
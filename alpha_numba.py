@@ -0,0 +1,160 @@
+"""
+Numba kernels of the Alpha Miner for footprints of up to 64 events.
+A set of events is a uint64 bitmask, bit i standing for the event with ID i.
+"""
+import numpy as np
+from numba import njit, types
+from numba.typed import List
+
+MAX_EVENTS = 64
+
+ZERO = np.uint64(0)
+ONE = np.uint64(1)
+
+@njit(cache=True)
+def popcount(x):
+    """
+    Counts the set bits of a uint64 bitmask (SWAR popcount).
+
+    Parameters:
+        x (uint64): Bitmask.
+
+    Returns:
+        int: Number of set bits.
+    """
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return np.int64((x * np.uint64(0x0101010101010101)) >> np.uint64(56))
+
+@njit(cache=True)
+def lowest_bit(x):
+    """
+    Returns the index of the lowest set bit of a non-zero uint64 bitmask.
+
+    Parameters:
+        x (uint64): Bitmask.
+
+    Returns:
+        int: Index of the lowest set bit.
+    """
+    return popcount((x & (~x + ONE)) - ONE)
+
+@njit(cache=True)
+def choose_pivot(P, X, adjacency):
+    """
+    Chooses the vertex of P | X with the most neighbors in P.
+
+    Parameters:
+        P (uint64): Candidate vertices.
+        X (uint64): Processed vertices.
+        adjacency (ndarray): uint64 adjacency bitmask of every vertex.
+
+    Returns:
+        int: Pivot vertex.
+    """
+    pivot = -1
+    best = -1
+    remaining = P | X
+    while remaining != ZERO:
+        u = lowest_bit(remaining)
+        remaining &= remaining - ONE
+        count = popcount(P & adjacency[u])
+        if count > best:
+            pivot = u
+            best = count
+    return pivot
+
+@njit(cache=True)
+def maximal_cliques(adjacency, vertices):
+    """
+    Enumerates maximal cliques among the given vertices with the Bron-Kerbosch algorithm with pivoting.
+    The recursion is unrolled into one (R, P, X, candidates) frame per depth.
+
+    Parameters:
+        adjacency (ndarray): uint64 adjacency bitmask of every vertex.
+        vertices (uint64): Bitmask of the vertices the cliques are taken from.
+
+    Returns:
+        list: uint64 bitmasks of the maximal cliques.
+    """
+    n = adjacency.shape[0]
+    cliques = List.empty_list(types.uint64)
+    if vertices == ZERO:
+        cliques.append(ZERO)
+        return cliques
+
+    # Every frame adds one vertex to R, so there are at most n + 1 of them
+    R = np.zeros(n + 1, dtype=np.uint64)
+    P = np.zeros(n + 1, dtype=np.uint64)
+    X = np.zeros(n + 1, dtype=np.uint64)
+    candidates = np.zeros(n + 1, dtype=np.uint64)
+    P[0] = vertices
+    candidates[0] = vertices & ~adjacency[choose_pivot(P[0], X[0], adjacency)]
+
+    depth = 0
+    while depth >= 0:
+        if candidates[depth] == ZERO:
+            depth -= 1
+            continue
+        v = lowest_bit(candidates[depth])
+        bit = ONE << np.uint64(v)
+        candidates[depth] ^= bit
+        r = R[depth] | bit
+        p = P[depth] & adjacency[v]
+        x = X[depth] & adjacency[v]
+        P[depth] ^= bit
+        X[depth] |= bit
+        if p == ZERO:
+            if x == ZERO:
+                cliques.append(r)
+            continue
+        depth += 1
+        R[depth] = r
+        P[depth] = p
+        X[depth] = x
+        candidates[depth] = p & ~adjacency[choose_pivot(p, x, adjacency)]
+    return cliques
+
+@njit(cache=True)
+def transition_codes(matrix, set_events, set_sizes, no_relation):
+    """
+    Finds the pairs of independent sets whose event pairs all share one footprint code.
+
+    Parameters:
+        matrix (ndarray): uint8 footprint matrix.
+        set_events (ndarray): Event IDs of every independent set, one row per set padded to the largest set.
+        set_sizes (ndarray): Number of events of every independent set.
+        no_relation (int): Code of ' # ', pairs with this relationship are skipped.
+
+    Returns:
+        ndarray: Rows (first set, second set, code) for every pair with a single code other than no_relation.
+    """
+    k = set_sizes.shape[0]
+    firsts = List.empty_list(types.int64)
+    seconds = List.empty_list(types.int64)
+    codes = List.empty_list(types.int64)
+    for i in range(k):
+        for j in range(i + 1, k):
+            first = matrix[set_events[i, 0], set_events[j, 0]]
+            if first == no_relation:
+                continue
+            mixed = False
+            for a in range(set_sizes[i]):
+                for b in range(set_sizes[j]):
+                    if matrix[set_events[i, a], set_events[j, b]] != first:
+                        mixed = True
+                        break
+                if mixed:
+                    break
+            if not mixed:
+                firsts.append(i)
+                seconds.append(j)
+                codes.append(np.int64(first))
+
+    result = np.empty((len(codes), 3), dtype=np.int64)
+    for t in range(len(codes)):
+        result[t, 0] = firsts[t]
+        result[t, 1] = seconds[t]
+        result[t, 2] = codes[t]
+    return result
@@ -3,6 +3,7 @@ import pandas as pd
 import os
 import json
 import graphviz
+import hashlib
 import logging
 import traceback
 import alpha_miner_logic as alpha_algo_app
@@ -14,6 +15,9 @@ with open(os.path.join(PARAMETERS_PATH, PARAMETERS_FILE_NAME)) as f:
     param = json.load(f)
 texts = param['texts']
 
+# Number of rendered process diagrams kept in the diagram cache folder
+DIAGRAM_CACHE_SIZE = 32
+
 # List CSV files in the specified folder
 csv_files = [f for f in os.listdir(param["analysed_log_path"]) if f.endswith('.csv')]
 
@@ -103,6 +107,8 @@ def display_footprint_matrix(footprint):
 def create_process_diagram(initial_events, final_events, nodes, filtered_transitions):
     """
     Creates a process diagram and displays it using Streamlit.
+    The PNG is named after a hash of the inputs and reused when it was already rendered.
+    Only the DIAGRAM_CACHE_SIZE most recently used diagrams are kept in the cache folder.
     Parameters:
         initial_events (set): Set of initial events.
         final_events (set): Set of final events.
@@ -112,6 +118,15 @@ def create_process_diagram(initial_events, final_events, nodes, filtered_transit
     Returns:
         str: The path to the generated process diagram PNG file.
     """
+    # Rendering shells out to the dot binary, skip it when the same diagram already exists
+    diagram_key = hashlib.blake2b(repr((sorted(initial_events), sorted(final_events), sorted(nodes),
+                                        sorted(filtered_transitions.items()))).encode()).hexdigest()[:16]
+    file_path = os.path.join(param['diagram_cache_path'], f'process_diagram_{diagram_key}')
+    if os.path.exists(f'{file_path}.png'):
+        # Mark the diagram as recently used so that it is the last one pruned
+        os.utime(f'{file_path}.png')
+        return f'{file_path}.png'
+
     dot = graphviz.Digraph(comment='Petri Net')
     dot.attr(rankdir='LR', size='16')
     # Node styles
@@ -156,46 +171,79 @@ def create_process_diagram(initial_events, final_events, nodes, filtered_transit
         dot.edge(event, 'end')
 
     # Render the diagram
-    file_path = os.path.join(param['analysed_log_path'], 'process_diagram')
     dot.render(filename=file_path, format='png', cleanup=True)
     print(f"Process diagram has been generated as '{file_path}.png'")
+    prune_diagram_cache()
    
     return f'{file_path}.png'
 
+def prune_diagram_cache():
+    """
+    Removes the least recently used files of the diagram cache folder beyond DIAGRAM_CACHE_SIZE.
+    """
+    cache_path = param['diagram_cache_path']
+    cached_files = sorted((os.path.join(cache_path, f) for f in os.listdir(cache_path)),
+                          key=os.path.getmtime, reverse=True)
+    for cached_file in cached_files[DIAGRAM_CACHE_SIZE:]:
+        os.remove(cached_file)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def run_analysis(selected_file, min_frequency, file_mtime):
+    """
+    Runs the Alpha Miner steps on a log file, cached by Streamlit.
+    Parameters:
+        selected_file (str): Name of the log file.
+        min_frequency (float): Minimum frequency of the kept traces.
+        file_mtime (float): Modification time of the file, only part of the cache key so that an edited file is analysed again.
+
+    Returns:
+        tuple: Every intermediate result displayed by start_analyser.
+    """
+    traces_dict = alpha_algo_app.read_log_file(selected_file)
+    traces_dict = {trace: info for trace, info in traces_dict.items() if info['frequency'] >= min_frequency}
+    
+    initial_events, final_events = alpha_algo_app.identify_initial_and_final_events(traces_dict)
+    nodes = alpha_algo_app.identify_all_nodes(traces_dict)
+    directly_follows = alpha_algo_app.compute_directly_follows(traces_dict, initial_events, final_events)
+    footprint = alpha_algo_app.create_footprint(directly_follows)
+    independent_sets = alpha_algo_app.find_independent_sets(footprint)
+    transitions = alpha_algo_app.find_transitions(footprint, independent_sets)
+    filtered_transitions = alpha_algo_app.filter_maximal_sets(transitions)
+    # The analysis works on event IDs, the displayed results use the event names
+    return (traces_dict, initial_events, final_events, nodes, directly_follows.to_dict(), dict(footprint),
+            alpha_algo_app.name_independent_sets(footprint, independent_sets),
+            alpha_algo_app.name_transitions(footprint, transitions),
+            alpha_algo_app.name_transitions(footprint, filtered_transitions))
 
 def start_analyser(selected_file, min_frequency=0):
     try:
-        traces_dict = alpha_algo_app.read_log_file(selected_file)
-        traces_dict = {trace: info for trace, info in traces_dict.items() if info['frequency'] >= min_frequency}
-        
-        initial_events, final_events = alpha_algo_app.identify_initial_and_final_events(traces_dict)
-        nodes = alpha_algo_app.identify_all_nodes(traces_dict)
-        directly_follows = alpha_algo_app.compute_directly_follows(traces_dict, initial_events, final_events)
-        footprint = alpha_algo_app.create_footprint(directly_follows)
-        independent_sets = alpha_algo_app.find_independent_sets(footprint)
-        transitions = alpha_algo_app.find_transitions(footprint, independent_sets)
-        filtered_transitions = alpha_algo_app.filter_maximal_sets(transitions)
-
-        display_traces_table(traces_dict)
-        display_directly_follows(directly_follows)
-        display_single_column_table(nodes, 'Nodes', 'Nodes')
-        display_single_column_table(initial_events, 'Initial Events', 'Initial Events')
-        display_single_column_table(final_events, 'Final Events', 'Final Events')
-        display_footprint_matrix(footprint)
-
-        flattened_independent_data = [' ; '.join(sorted(list(item))) for item in independent_sets]
-        display_single_column_table(flattened_independent_data, 'Independent Sets', 'Independent Sets')
-
-        # Convert transitions to list of tuples
-        transitions_tuples = list(transitions.items())
-        display_two_column_table(transitions_tuples, ('Sequence', 'Transition'), 'Transitions')
-        
-        # Convert filtered transitions to list of tuples
-        filtered_transitions_tuples = list(filtered_transitions.items())
-        display_two_column_table(filtered_transitions_tuples, ('Filtered Sequence', 'Transition'), 'Filtered Transitions')
-
-        diagram_path = create_process_diagram(initial_events, final_events, nodes, filtered_transitions)
-        st.image(diagram_path, caption='Process Diagram', use_column_width=False)
+        file_mtime = os.path.getmtime(os.path.join(param['analysed_log_path'], selected_file))
+        with st.spinner("Analysing the log..."):
+            (traces_dict, initial_events, final_events, nodes, directly_follows, footprint,
+             independent_sets, transitions, filtered_transitions) = run_analysis(selected_file, min_frequency, file_mtime)
+
+        with st.container():
+            display_traces_table(traces_dict)
+            display_directly_follows(directly_follows)
+            display_single_column_table(nodes, 'Nodes', 'Nodes')
+            display_single_column_table(initial_events, 'Initial Events', 'Initial Events')
+            display_single_column_table(final_events, 'Final Events', 'Final Events')
+            display_footprint_matrix(footprint)
+
+            flattened_independent_data = [' ; '.join(sorted(list(item))) for item in independent_sets]
+            display_single_column_table(flattened_independent_data, 'Independent Sets', 'Independent Sets')
+
+            # Convert transitions to list of tuples
+            transitions_tuples = list(transitions.items())
+            display_two_column_table(transitions_tuples, ('Sequence', 'Transition'), 'Transitions')
+            
+            # Convert filtered transitions to list of tuples
+            filtered_transitions_tuples = list(filtered_transitions.items())
+            display_two_column_table(filtered_transitions_tuples, ('Filtered Sequence', 'Transition'), 'Filtered Transitions')
+
+            diagram_path = create_process_diagram(initial_events, final_events, nodes, filtered_transitions)
+            st.image(diagram_path, caption='Process Diagram', use_column_width=False)
         
     except Exception as e:
         logging.error(f"An error occurred while processing file: {selected_file} {e}\n{traceback.format_exc()}")